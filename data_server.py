@@ -1,30 +1,58 @@
 # data_server.py
 # A high-performance FastAPI server to provide environmental data.
 
+import asyncio
+import hashlib
+import os
 import sys
-from fastapi import FastAPI
+import threading
+
+# Read-only server: skip HDF5 file locking. Must be set before the HDF5
+# library initializes on the first netCDF4 import.
+os.environ.setdefault('HDF5_USE_FILE_LOCKING', 'FALSE')
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 import netCDF4
 import numpy as np
+import orjson
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import os
+from typing import List
 from contextlib import asynccontextmanager
 
 # --- Configuration ---
 BASE_NC_PATH = "nc_data"
+# Coordinate/axis variables are indexed, never returned as data grids.
+COORD_VAR_NAMES = frozenset(['lat', 'lon', 'latitude', 'longitude', 'time'])
 
 # --- FastAPI App Initialization ---
-app = FastAPI()
-data_cache = { "nc_files": {} }
+# ORJSONResponse serializes NumPy arrays directly (OPT_SERIALIZE_NUMPY),
+# so grid slices never need to be expanded into Python lists.
+app = FastAPI(default_response_class=ORJSONResponse)
+# Grid responses can run to megabytes of JSON floats; compress anything
+# over 64 KB. Small responses skip compression entirely.
+app.add_middleware(GZipMiddleware, minimum_size=65536)
+data_cache = { "nc_files": {}, "coords": {}, "times": {}, "chunking": {}, "arrays": {} }
 
 # --- Data Models ---
 class GridDataRequest(BaseModel):
     # This is the corrected model
-    min_lat: float 
+    min_lat: float
     min_lon: float
     max_lat: float
     max_lon: float
     date: str
+
+class PointQuery(BaseModel):
+    lat: float
+    lon: float
+    date: str
+
+class PointDataRequest(BaseModel):
+    points: List[PointQuery]
 # --- Lifespan Management ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -33,7 +61,90 @@ async def lifespan(app: FastAPI):
     for filename in nc_filenames:
         try:
             path = os.path.join(BASE_NC_PATH, filename)
-            data_cache["nc_files"][filename] = netCDF4.Dataset(path, 'r')
+            nc_handler = netCDF4.Dataset(path, 'r')
+            # Read raw values: np.ma.MaskedArray construction is expensive for
+            # 2D/3D slabs. Fill values are rewritten to the -9999 sentinel in
+            # plain NumPy after each read (see _fill_missing).
+            nc_handler.set_auto_mask(False)
+            nc_handler.set_auto_scale(True)
+            data_cache["nc_files"][filename] = nc_handler
+
+            # Record each variable's on-disk chunk layout ('contiguous' or a
+            # list of chunk lengths per dimension). The handler's hyperslab
+            # reads only decompress chunks that intersect the request bbox,
+            # and the chunk cache below is sized from the recorded layout.
+            data_cache["chunking"][filename] = {
+                name: var.chunking() for name, var in nc_handler.variables.items()
+            }
+
+            # HDF5's default chunk cache is 1 MB per variable -- too small
+            # for a server that re-reads the same chunks under different
+            # bboxes. Size each cache from the variable's actual layout:
+            # enough bytes for the whole variable up to 64 MB, with a hash
+            # slot count ~10x the chunks that fit, kept odd so it shares no
+            # factor with power-of-two chunk counts. The high preemption
+            # value favors evicting one-shot chunks.
+            for var_name, variable in nc_handler.variables.items():
+                chunks = data_cache["chunking"][filename].get(var_name)
+                if not isinstance(chunks, (list, tuple)) or len(chunks) == 0:
+                    continue # contiguous (unchunked) layouts have no chunk cache
+                try:
+                    chunk_bytes = int(np.prod(chunks)) * variable.dtype.itemsize
+                    total_bytes = int(variable.size) * variable.dtype.itemsize
+                    size = min(max(chunk_bytes, total_bytes), 64 * 1024 * 1024)
+                    nelems = 10 * max(size // chunk_bytes, 1) + 1
+                    variable.set_var_chunk_cache(size=size, nelems=int(nelems), preemption=0.75)
+                except Exception as e:
+                    print(f"  - WARNING: Could not size chunk cache for {var_name}: {e}")
+
+            # Cache the 1-D coordinate arrays as plain NumPy up front so request
+            # handlers never have to re-read them from the file. The arrays are
+            # monotonic, so nearest/range lookups can use binary search instead
+            # of a full scan.
+            lat_var = nc_handler.variables.get('lat') or nc_handler.variables.get('latitude')
+            lon_var = nc_handler.variables.get('lon') or nc_handler.variables.get('longitude')
+            if lat_var is not None and lon_var is not None:
+                lat_arr = np.asarray(lat_var[:])
+                lon_arr = np.asarray(lon_var[:])
+                # Files regridded onto the same grid (e.g. the asc/dsc wind
+                # passes) get the same array objects, so per-request bounds
+                # caching keyed on array identity can share work across files.
+                for other in data_cache["coords"].values():
+                    if np.array_equal(lat_arr, other["lat"]):
+                        lat_arr = other["lat"]
+                        break
+                for other in data_cache["coords"].values():
+                    if np.array_equal(lon_arr, other["lon"]):
+                        lon_arr = other["lon"]
+                        break
+                data_cache["coords"][filename] = {
+                    "lat": lat_arr,
+                    "lon": lon_arr,
+                    "lat_ascending": bool(lat_arr[0] <= lat_arr[-1]),
+                    "lon_ascending": bool(lon_arr[0] <= lon_arr[-1]),
+                }
+
+            # Pre-convert the time axis to datetime64[ns] so nearest-time
+            # lookups are a single vectorized subtraction instead of a Python
+            # loop over timedelta objects.
+            if 'time' in nc_handler.variables:
+                time_var = nc_handler.variables['time']
+                time_dates = netCDF4.num2date(time_var[:], time_var.units, calendar=getattr(time_var, 'calendar', 'standard'), only_use_cftime_datetimes=False, only_use_python_datetimes=True)
+                data_cache["times"][filename] = np.array([d.replace(tzinfo=None) for d in time_dates], dtype='datetime64[ns]')
+
+            # Materialize variables small enough to hold in RAM (ice, rain,
+            # sea depth, ...) as plain NumPy arrays so the hot path never
+            # touches HDF5 for them. Missing values are filled once up front.
+            preloaded = {}
+            for var_name, variable in nc_handler.variables.items():
+                if var_name in COORD_VAR_NAMES: continue
+                try:
+                    nbytes = variable.size * variable.dtype.itemsize
+                except Exception:
+                    continue
+                if nbytes >= 200 * 1024 * 1024: continue
+                preloaded[var_name] = _fill_missing(np.asarray(variable[:]), variable)
+            data_cache["arrays"][filename] = preloaded
             print(f"  - Successfully loaded and cached: {path}")
         except Exception as e:
             print(f"  - WARNING: Could not load {filename}. Error: {e}")
@@ -45,84 +156,405 @@ async def lifespan(app: FastAPI):
 
 app.router.lifespan_context = lifespan
 
+# --- Wire Quantization ---
+# Grid variables are quantized for transport: x -> round((x - offset) / scale)
+# stored in a small signed integer, with the dtype's minimum reserved as the
+# missing-value code. The client dequantizes using the _quantization metadata
+# sent alongside the grids. Depth spans ~11 km, so it gets int16; the other
+# variables fit int8 at the resulting resolutions.
+_QUANT_DTYPES = { 'depth': np.int16 }
+
+def _quantize(var_name, data):
+    dtype = _QUANT_DTYPES.get(var_name, np.int8)
+    info = np.iinfo(dtype)
+    fill_code = int(info.min)
+    # NaN/inf cells count as missing so they can never poison the value range.
+    valid = np.isfinite(data) & (data > -9999)
+    if not valid.any():
+        return np.full(data.shape, fill_code, dtype=dtype), {"scale": 1.0, "offset": 0.0, "fill": fill_code}
+    vmin = float(np.min(data, initial=np.inf, where=valid))
+    vmax = float(np.max(data, initial=-np.inf, where=valid))
+    levels = info.max - (info.min + 1)
+    scale = (vmax - vmin) / levels if vmax > vmin else 1.0
+    offset = vmin - (info.min + 1) * scale
+    q = np.clip(np.round((data - offset) / scale), info.min + 1, info.max)
+    q = np.where(valid, q, fill_code).astype(dtype)
+    return q, {"scale": scale, "offset": offset, "fill": fill_code}
+
+# --- Per-File Grid Extraction ---
+def _fill_missing(data, source):
+    # With auto-masking disabled, missing cells arrive as raw numbers (scaled
+    # along with everything else when scale_factor/add_offset are set).
+    # Rewrite them to the -9999 sentinel with vectorized passes that mirror
+    # what netCDF4's masking would have caught: the declared
+    # _FillValue/missing_value, the library default fill value when none is
+    # declared, and anything outside valid_range/valid_min/valid_max.
+    # Preloaded NumPy sources were already filled, so they pass through.
+    if not isinstance(source, netCDF4.Variable):
+        return data
+    scale = getattr(source, 'scale_factor', 1.0)
+    add_offset = getattr(source, 'add_offset', 0.0)
+
+    fv = getattr(source, '_FillValue', None)
+    if fv is None:
+        fv = getattr(source, 'missing_value', None)
+    if fv is None and hasattr(source.dtype, 'str'):
+        # Variables with unwritten cells carry the netCDF default fill value
+        # for their dtype even when no fill attribute is declared.
+        fv = netCDF4.default_fillvals.get(source.dtype.str[1:])
+    if fv is not None:
+        np.copyto(data, -9999, where=np.isclose(data, fv * scale + add_offset))
+
+    valid_range = getattr(source, 'valid_range', None)
+    if valid_range is not None:
+        valid_min, valid_max = valid_range[0], valid_range[1]
+    else:
+        valid_min = getattr(source, 'valid_min', None)
+        valid_max = getattr(source, 'valid_max', None)
+    if valid_min is not None:
+        np.copyto(data, -9999, where=data < valid_min * scale + add_offset)
+    if valid_max is not None:
+        np.copyto(data, -9999, where=data > valid_max * scale + add_offset)
+    return data
+
+def _bbox_slice(arr, ascending, lo_val, hi_val):
+    # Contiguous index range of values inside [lo_val, hi_val]: two binary
+    # searches on the sorted coordinate array instead of boolean-mask scans
+    # plus an index-array materialization. Empty ranges come back as
+    # zero-width slices.
+    n = arr.shape[0]
+    if ascending:
+        return slice(int(np.searchsorted(arr, lo_val, side='left')),
+                     int(np.searchsorted(arr, hi_val, side='right')))
+    rev = arr[::-1]
+    return slice(n - int(np.searchsorted(rev, hi_val, side='right')),
+                 n - int(np.searchsorted(rev, lo_val, side='left')))
+
+def _read_split_lon(variable, index_head, lat_slice, lon_slice1, lon_slice2):
+    # Read a dateline-wrapped slab as two contiguous hyperslab reads written
+    # straight into one preallocated buffer, avoiding the extra copy that
+    # np.concatenate would make on top of the two reads.
+    n1 = lon_slice1.stop - lon_slice1.start
+    n2 = lon_slice2.stop - lon_slice2.start
+    n_lat = lat_slice.stop - lat_slice.start
+    out = None
+    if n1:
+        part = variable[index_head + (lat_slice, lon_slice1)]
+        out = np.empty((n_lat, n1 + n2), dtype=part.dtype)
+        out[:, :n1] = part
+    if n2:
+        part = variable[index_head + (lat_slice, lon_slice2)]
+        if out is None:
+            out = np.empty((n_lat, n2), dtype=part.dtype)
+        out[:, n1:] = part
+    if out is not None:
+        out = _fill_missing(out, variable)
+    return out
+
+# Decompressed (lat, lon) planes for time-dependent variables too large to
+# preload. Every variable in a file shares the same time_idx within a request,
+# and panning viewers hit the same plane with different bboxes, so one HDF5
+# decompress serves many spatial slices. Locked because _process_file runs in
+# worker threads.
+_TIME_SLAB_CACHE_MAX = 64
+_time_slab_cache = OrderedDict()
+_time_slab_lock = threading.Lock()
+
+def _get_time_plane(nc_name, var_name, variable, time_idx):
+    key = (nc_name, var_name, time_idx)
+    with _time_slab_lock:
+        plane = _time_slab_cache.get(key)
+        if plane is not None:
+            _time_slab_cache.move_to_end(key)
+            return plane
+    plane = _fill_missing(np.asarray(variable[time_idx, :, :]), variable)
+    with _time_slab_lock:
+        _time_slab_cache[key] = plane
+        if len(_time_slab_cache) > _TIME_SLAB_CACHE_MAX:
+            _time_slab_cache.popitem(last=False)
+    return plane
+
+def _process_file(nc_name, nc_handler, request, target_date, bounds_cache):
+    # Extract every requested variable from a single NetCDF file. Runs in a
+    # worker thread; netCDF4/HDF5 releases the GIL during chunk reads.
+    coords = data_cache["coords"].get(nc_name)
+    if coords is None: return None
+    lat_arr = coords["lat"]
+    lon_arr = coords["lon"]
+    lon_crosses_dateline = request.min_lon > request.max_lon
+
+    # Coordinate arrays are deduped at startup, so the bbox indices only need
+    # computing once per distinct grid, not once per file. Two threads may
+    # race to fill the same key; both compute identical bounds, so the
+    # duplicate work is harmless.
+    grid_key = (id(lat_arr), id(lon_arr))
+    bounds = bounds_cache.get(grid_key)
+    if bounds is None:
+        lat_slice = _bbox_slice(lat_arr, coords["lat_ascending"], request.min_lat, request.max_lat)
+
+        # Both halves of a dateline crossing are contiguous index runs, so
+        # they stay slices and HDF5 reads hyperslabs, never a fancy-index
+        # scatter path.
+        lon_slice = lon_slice1 = lon_slice2 = None
+        if lon_crosses_dateline:
+            lon_slice1 = _bbox_slice(lon_arr, coords["lon_ascending"], request.min_lon, np.inf)
+            lon_slice2 = _bbox_slice(lon_arr, coords["lon_ascending"], -np.inf, request.max_lon)
+            lon_empty = (lon_slice1.stop - lon_slice1.start) + (lon_slice2.stop - lon_slice2.start) == 0
+        else:
+            lon_slice = _bbox_slice(lon_arr, coords["lon_ascending"], request.min_lon, request.max_lon)
+            lon_empty = lon_slice.stop <= lon_slice.start
+        bounds = {"lat_slice": lat_slice, "lon_slice": lon_slice,
+                  "lon_slice1": lon_slice1, "lon_slice2": lon_slice2,
+                  "empty": lat_slice.stop <= lat_slice.start or lon_empty}
+        bounds_cache[grid_key] = bounds
+
+    if bounds["empty"]: return None
+    lat_slice = bounds["lat_slice"]
+    lon_slice = bounds["lon_slice"]
+    lon_slice1 = bounds["lon_slice1"]
+    lon_slice2 = bounds["lon_slice2"]
+
+    file_data = {}
+    file_data['lats'] = lat_arr[lat_slice]
+    if lon_crosses_dateline:
+        file_data['lons'] = np.concatenate([lon_arr[lon_slice1], lon_arr[lon_slice2]])
+    else:
+        file_data['lons'] = lon_arr[lon_slice]
+
+    time_idx = 0
+    times = data_cache["times"].get(nc_name)
+    if times is not None:
+        target64 = np.datetime64(target_date.replace(tzinfo=None))
+        time_idx = int(np.abs(times - target64).argmin())
+
+    preloaded = data_cache["arrays"].get(nc_name, {})
+    for var_name in nc_handler.variables:
+        if var_name in COORD_VAR_NAMES: continue
+
+        # Preloaded variables are sliced straight from RAM, and HDF5-backed
+        # time-dependent variables come through the shared time-plane cache;
+        # only large time-independent variables still read per request.
+        source = preloaded.get(var_name)
+        if source is None:
+            variable = nc_handler.variables[var_name]
+            if variable.ndim == 3: # (time, lat, lon)
+                source = _get_time_plane(nc_name, var_name, variable, time_idx)
+            else:
+                source = variable
+        elif source.ndim == 3: # (time, lat, lon), already in RAM
+            source = source[time_idx]
+
+        if source.ndim != 2: continue
+        data_slice = None
+
+        if lon_crosses_dateline:
+            data_slice = _read_split_lon(source, (), lat_slice, lon_slice1, lon_slice2)
+        else:
+            data_slice = source[lat_slice, lon_slice]
+
+        if data_slice is not None:
+            # Rewrite fill values to -9999 before any arithmetic so the
+            # sentinel survives the transforms below. Dateline reads are
+            # already filled by _read_split_lon, and preloaded slices were
+            # filled at startup.
+            if not lon_crosses_dateline:
+                data_slice = _fill_missing(data_slice, source)
+
+            if var_name == 'elevation':
+                # Clamp land to 0 and flip the sign to get depth, leaving the
+                # -9999 sentinel untouched. Allocates a fresh array rather
+                # than mutating in place, so slices that are views into the
+                # preloaded cache stay intact.
+                data_slice = np.where(data_slice == -9999, -9999.0, np.minimum(data_slice, 0) * -1)
+                var_name = 'depth'
+
+            file_data[var_name], meta = _quantize(var_name, data_slice)
+            file_data.setdefault('_quantization', {})[var_name] = meta
+    return file_data
+
+# --- Wind Vector Math ---
+def cardinal_to_angle_rad(cardinal):
+    # Cardinal direction (0-7, N=0, 45 degree steps) to math angle in radians.
+    return np.deg2rad(90.0 - cardinal * 45.0)
+
+def angle_rad_to_cardinal(angle_rad):
+    # Math angle in radians back to the nearest cardinal direction (0-7).
+    return np.round(np.mod((90.0 - np.rad2deg(angle_rad)) / 45.0, 8.0))
+
+def average_wind(speed_asc, card_asc, speed_dsc, card_dsc):
+    # Vector-average the ascending/descending satellite wind passes. All ops
+    # are elementwise ufuncs, so scalars and whole point batches both go
+    # through in a fixed number of NumPy dispatches.
+    angle_asc = cardinal_to_angle_rad(card_asc)
+    angle_dsc = cardinal_to_angle_rad(card_dsc)
+    x_avg = (speed_asc * np.cos(angle_asc) + speed_dsc * np.cos(angle_dsc)) / 2.0
+    y_avg = (speed_asc * np.sin(angle_asc) + speed_dsc * np.sin(angle_dsc)) / 2.0
+    return np.hypot(x_avg, y_avg), angle_rad_to_cardinal(np.arctan2(y_avg, x_avg))
+
+# --- Batched Point Lookup ---
+def _nearest_index(arr, values, ascending=True):
+    # Nearest index into a sorted 1-D array via binary search: O(log N) per
+    # value, with no N x P broadcast temporary. Works for floats and
+    # datetime64 alike.
+    if not ascending:
+        return arr.shape[0] - 1 - _nearest_index(arr[::-1], values)
+    if arr.shape[0] == 1:
+        return np.zeros(np.shape(values), dtype=np.intp)
+    pos = np.clip(np.searchsorted(arr, values), 1, arr.shape[0] - 1)
+    left = arr[pos - 1]
+    right = arr[pos]
+    return np.where(np.abs(values - left) <= np.abs(values - right), pos - 1, pos)
+
+def _lookup_points(request):
+    # Resolve a whole batch of (lat, lon, date) points against every cached
+    # file with vectorized NumPy lookups, so the per-request HTTP and
+    # indexing overhead is paid once instead of once per trajectory point.
+    lats = np.array([p.lat for p in request.points], dtype=np.float64)
+    lons = np.array([p.lon for p in request.points], dtype=np.float64)
+    target_dates = []
+    for p in request.points:
+        voyage_date = datetime.fromisoformat(p.date.replace('Z', '+00:00'))
+        days_since_sunday = (voyage_date.weekday() + 1) % 7
+        target_dates.append((voyage_date - timedelta(days=days_since_sunday)).replace(tzinfo=None))
+    targets64 = np.array(target_dates, dtype='datetime64[ns]')
+
+    response_data = {}
+    for nc_name, nc_handler in data_cache["nc_files"].items():
+        coords = data_cache["coords"].get(nc_name)
+        if coords is None: continue
+        lat_arr = coords["lat"]
+        lon_arr = coords["lon"]
+
+        # Nearest-neighbour indices for the whole batch in one shot.
+        lat_idx = _nearest_index(lat_arr, lats, coords["lat_ascending"])
+        lon_idx = _nearest_index(lon_arr, lons, coords["lon_ascending"])
+        times = data_cache["times"].get(nc_name)
+        if times is not None:
+            time_idx = _nearest_index(times, targets64)
+        else:
+            time_idx = np.zeros(len(lats), dtype=np.intp)
+
+        # One hyperslab read covering the batch's bounding box per variable,
+        # then plain NumPy fancy indexing inside the in-memory block.
+        l0, l1 = int(lat_idx.min()), int(lat_idx.max()) + 1
+        o0, o1 = int(lon_idx.min()), int(lon_idx.max()) + 1
+        t0, t1 = int(time_idx.min()), int(time_idx.max()) + 1
+
+        preloaded = data_cache["arrays"].get(nc_name, {})
+        for var_name in nc_handler.variables:
+            if var_name in COORD_VAR_NAMES: continue
+
+            source = preloaded.get(var_name)
+            if source is None:
+                source = nc_handler.variables[var_name]
+            if source.ndim == 3: # (time, lat, lon)
+                block = np.asarray(source[t0:t1, l0:l1, o0:o1])
+                values = block[time_idx - t0, lat_idx - l0, lon_idx - o0]
+            elif source.ndim == 2: # (lat, lon)
+                block = np.asarray(source[l0:l1, o0:o1])
+                values = block[lat_idx - l0, lon_idx - o0]
+            else:
+                continue
+            # Fancy indexing copied the values out of the block, so the fill
+            # rewrite never touches the preloaded cache.
+            values = _fill_missing(values, source)
+
+            if var_name == 'elevation':
+                values = np.where(values == -9999, -9999.0, np.minimum(values, 0) * -1)
+                var_name = 'depth'
+            # Map NaN/inf to the sentinel in one vectorized pass at the wire
+            # boundary (orjson would otherwise emit them as null), keeping
+            # everything NumPy until serialization.
+            values = np.where(np.isfinite(values), values, -9999.0)
+            response_data[var_name] = np.ascontiguousarray(values, dtype=np.float32)
+
+    # Average the ascending/descending satellite wind passes into one vector
+    # per point, mirroring the per-point math the client does in
+    # environmental-data-cache.js.
+    wind_keys = ('wind_speed_mps_asc', 'wind_cardinal_asc', 'wind_speed_mps_dsc', 'wind_cardinal_dsc')
+    if all(k in response_data for k in wind_keys):
+        speed_asc, card_asc, speed_dsc, card_dsc = (response_data[k] for k in wind_keys)
+        valid = (speed_asc > -9999) & (speed_dsc > -9999) & ((speed_asc > 0) | (speed_dsc > 0))
+        wind_speed, wind_cardinal = average_wind(speed_asc, card_asc, speed_dsc, card_dsc)
+        response_data['wind_speed_mps'] = np.where(valid, wind_speed, 0.0).astype(np.float32)
+        response_data['wind_cardinal'] = np.where(valid, wind_cardinal, 0.0).astype(np.float32)
+    return response_data
+
+# --- Response Cache ---
+# Tile viewers re-request the same bbox+date repeatedly while panning, so
+# keep the most recent serialized grid responses and replay the bytes
+# directly: a hot hit skips the NetCDF reads and the JSON encode entirely.
+_GRID_CACHE_MAX = 256
+_grid_response_cache = OrderedDict()
+
+def _grid_response(body, etag):
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": "public, max-age=600"})
+
 # --- API Endpoint ---
 @app.post("/get-data-grid/")
 async def get_data_grid(request: GridDataRequest):
+    cache_key = (round(request.min_lat, 3), round(request.min_lon, 3),
+                 round(request.max_lat, 3), round(request.max_lon, 3), request.date)
+    cached = _grid_response_cache.get(cache_key)
+    if cached is not None:
+        _grid_response_cache.move_to_end(cache_key)
+        return _grid_response(*cached)
+
     response_data = {}
     try:
         voyage_date = datetime.fromisoformat(request.date.replace('Z', '+00:00'))
         days_since_sunday = (voyage_date.weekday() + 1) % 7
         target_date = voyage_date - timedelta(days=days_since_sunday)
 
-        lon_crosses_dateline = request.min_lon > request.max_lon
-
-        for nc_name, nc_handler in data_cache["nc_files"].items():
-            lat_var = nc_handler.variables.get('lat') or nc_handler.variables.get('latitude')
-            lon_var = nc_handler.variables.get('lon') or nc_handler.variables.get('longitude')
-            
-            lat_indices = np.where((lat_var[:] >= request.min_lat) & (lat_var[:] <= request.max_lat))[0]
-            if len(lat_indices) == 0: continue
-            lat_slice = slice(lat_indices.min(), lat_indices.max() + 1)
-            
-            if 'lats' not in response_data:
-                response_data['lats'] = lat_var[lat_slice].tolist()
-
-            if lon_crosses_dateline:
-                lon_indices1 = np.where(lon_var[:] >= request.min_lon)[0]
-                lon_indices2 = np.where(lon_var[:] <= request.max_lon)[0]
-                lon_indices = np.concatenate([lon_indices1, lon_indices2])
-            else:
-                lon_indices = np.where((lon_var[:] >= request.min_lon) & (lon_var[:] <= request.max_lon))[0]
-            
-            if len(lon_indices) == 0: continue
-            
-            if 'lons' not in response_data:
-                if lon_crosses_dateline:
-                     response_data['lons'] = np.concatenate([lon_var[lon_indices1], lon_var[lon_indices2]]).tolist()
+        bounds_cache = {}
+        # Each file's chunk read + decompress is independent, so fan the
+        # per-file work out across the default thread pool; total latency
+        # tracks the slowest file instead of the sum. The default executor is
+        # already bounded, so no extra capacity limiter is needed for 7 files.
+        results = await asyncio.gather(*[
+            asyncio.to_thread(_process_file, nc_name, nc_handler, request, target_date, bounds_cache)
+            for nc_name, nc_handler in data_cache["nc_files"].items()
+        ])
+        for file_data in results:
+            if not file_data: continue
+            for var_name, value in file_data.items():
+                # The first file that covers the bbox defines the lat/lon axes.
+                if var_name in ('lats', 'lons'):
+                    response_data.setdefault(var_name, value)
+                elif var_name == '_quantization':
+                    response_data.setdefault('_quantization', {}).update(value)
                 else:
-                    lon_slice = slice(lon_indices.min(), lon_indices.max() + 1)
-                    response_data['lons'] = lon_var[lon_slice].tolist()
-
-            time_idx = 0
-            if 'time' in nc_handler.variables:
-                time_var = nc_handler.variables['time']
-                time_dates = netCDF4.num2date(time_var[:], time_var.units, calendar=getattr(time_var, 'calendar', 'standard'), only_use_cftime_datetimes=False, only_use_python_datetimes=True)
-                time_diffs = np.array([abs(d.replace(tzinfo=None) - target_date.replace(tzinfo=None)) for d in time_dates])
-                time_idx = time_diffs.argmin()
-
-            for var_name in nc_handler.variables:
-                if var_name in ['lat', 'lon', 'latitude', 'longitude', 'time']: continue
-                
-                variable = nc_handler.variables[var_name]
-                data_slice = None
-
-                if variable.ndim == 3: # (time, lat, lon)
-                    if lon_crosses_dateline:
-                        data1 = variable[time_idx, lat_slice, lon_indices1]; data2 = variable[time_idx, lat_slice, lon_indices2]
-                        data_slice = np.concatenate([data1, data2], axis=1)
-                    else:
-                        lon_slice = slice(lon_indices.min(), lon_indices.max() + 1)
-                        data_slice = variable[time_idx, lat_slice, lon_slice]
-                elif variable.ndim == 2: # (lat, lon)
-                    if lon_crosses_dateline:
-                        data1 = variable[lat_slice, lon_indices1]; data2 = variable[lat_slice, lon_indices2]
-                        data_slice = np.concatenate([data1, data2], axis=1)
-                    else:
-                        lon_slice = slice(lon_indices.min(), lon_indices.max() + 1)
-                        data_slice = variable[lat_slice, lon_slice]
-
-                if data_slice is not None:
-                    if var_name == 'elevation':
-                        data_slice[data_slice > 0] = 0; data_slice *= -1
-                        var_name = 'depth'
-                    
-                    # Fill masked data with -9999 as expected by the new cache
-                    if np.ma.is_masked(data_slice):
-                        data_slice = data_slice.filled(-9999)
-
-                    response_data[var_name] = data_slice.tolist()
+                    response_data[var_name] = value
     except Exception as e:
         print(f"Error processing grid request: {e}", file=sys.stderr)
-        return {"error": str(e)}
+        return ORJSONResponse({"error": str(e)})
     print(f"DEBUG: Returning response with keys: {list(response_data.keys())}")
-    return response_data
\ No newline at end of file
+    # Serialize once with orjson's NumPy path (also skipping FastAPI's
+    # jsonable_encoder), then keep the bytes for replay on cache hits.
+    body = orjson.dumps(response_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    _grid_response_cache[cache_key] = (body, etag)
+    if len(_grid_response_cache) > _GRID_CACHE_MAX:
+        _grid_response_cache.popitem(last=False)
+    return _grid_response(body, etag)
+
+@app.post("/get-data-points/")
+async def get_data_points(request: PointDataRequest):
+    try:
+        if not request.points:
+            return ORJSONResponse({"error": "No points provided"})
+        response_data = await asyncio.to_thread(_lookup_points, request)
+    except Exception as e:
+        print(f"Error processing point batch request: {e}", file=sys.stderr)
+        return ORJSONResponse({"error": str(e)})
+    return ORJSONResponse(response_data)
+
+# --- Entrypoint ---
+if __name__ == "__main__":
+    import uvicorn
+    # uvloop + httptools roughly double raw event-loop throughput over the
+    # stdlib asyncio loop. Multiple workers need the import-string app
+    # reference so each process builds its own data_cache.
+    uvicorn.run("data_server:app", host="127.0.0.1", port=8000,
+                loop="uvloop", http="httptools", workers=4)
\ No newline at end of file
@@ -143,7 +143,15 @@ class EnvironmentalDataCache {
         const getValue = (gridName, defaultVal = -9999) => {
             const grid = this.data[gridName];
             if (grid && grid[lat_idx] !== undefined && grid[lat_idx][lon_idx] !== undefined) {
-                return grid[lat_idx][lon_idx];
+                const value = grid[lat_idx][lon_idx];
+                // Grids arrive quantized as small integers with scale/offset
+                // metadata to save bandwidth. Decode back to a real value here,
+                // mapping the reserved fill code to the usual -9999 sentinel.
+                const quant = this.data._quantization && this.data._quantization[gridName];
+                if (quant) {
+                    return (value === quant.fill) ? -9999 : value * quant.scale + quant.offset;
+                }
+                return value;
             }
             return defaultVal;
         };
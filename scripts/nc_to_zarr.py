@@ -0,0 +1,52 @@
+# scripts/nc_to_zarr.py
+# Offline converter: rewrite the NetCDF inputs as Zarr stores with Blosc+LZ4
+# compression and read-aligned chunks.
+#
+# Zarr trades HDF5's per-read metadata lookups for a flat key-value layout,
+# so a server doing many small random reads typically sees 2-4x faster cold
+# reads from the same disk. Run this offline against the nc_data directory:
+#
+#     python scripts/nc_to_zarr.py [nc_data_dir] [output_dir]
+#
+# Requires xarray + zarr, which the data server itself does not depend on.
+
+import os
+import sys
+
+import xarray as xr
+from numcodecs import Blosc
+
+# One time plane per chunk (requests always pick a single time index), with
+# 256x256 spatial tiles so a bbox read touches few chunks.
+DEFAULT_CHUNKS = {"time": 1, "lat": 256, "lon": 256, "latitude": 256, "longitude": 256}
+
+
+def convert(nc_path, zarr_path):
+    ds = xr.open_dataset(nc_path)
+    compressor = Blosc(cname="lz4", clevel=1, shuffle=Blosc.BITSHUFFLE)
+    encoding = {}
+    for name, var in ds.data_vars.items():
+        chunks = tuple(min(DEFAULT_CHUNKS.get(dim, size), size)
+                       for dim, size in zip(var.dims, var.shape))
+        encoding[name] = {"compressor": compressor, "chunks": chunks}
+    ds.to_zarr(zarr_path, mode="w", encoding=encoding)
+    ds.close()
+    print(f"  - Converted {nc_path} -> {zarr_path}")
+
+
+def main():
+    nc_dir = sys.argv[1] if len(sys.argv) > 1 else "nc_data"
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else nc_dir
+    for filename in sorted(os.listdir(nc_dir)):
+        if not filename.endswith(".nc"):
+            continue
+        nc_path = os.path.join(nc_dir, filename)
+        zarr_path = os.path.join(out_dir, filename[:-3] + ".zarr")
+        try:
+            convert(nc_path, zarr_path)
+        except Exception as e:
+            print(f"  - WARNING: Could not convert {filename}. Error: {e}")
+
+
+if __name__ == "__main__":
+    main()